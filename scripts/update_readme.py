@@ -8,13 +8,20 @@ the last ``ACTIVE_WINDOW_DAYS`` days is listed with:
 * Main Language  — primary language (HTML falls back to the largest non-HTML
   language since HTML is almost always template/GH-Pages boilerplate).
 * Total Bytes    — repo size reported by the listing endpoint.
-* Total Commits  — counted cheaply via the ``Link: rel="last"`` header trick.
+* Total Commits  — GraphQL ``history.totalCount``, or cheaply via the
+  ``Link: rel="last"`` header trick on the REST fallback.
 * Lifespan       — days between the first and most recent commit (the
   span of activity, not the age of the repo).
 * Team Size      — unique contributors to the default branch.
 
 Data sources
 ------------
+* GraphQL ``viewer.repositories`` (token only) — repo list plus, per repo,
+  the language breakdown, default-branch commit total and newest commit
+  date, 100 repos per request. A second, aliased query then reads the
+  oldest commit of ``OLDEST_COMMIT_BATCH`` repos at a time. Together they
+  replace the listing call and the ``/commits`` + ``/languages`` REST calls
+  below, which remain as the fallback.
 * REST ``/user/repos`` (or ``/users/:u/repos`` when unauthenticated) — full
   repo list; we filter it client-side by ``pushed_at``.
 * REST ``/repos/:o/:r/commits`` — total count + oldest commit date. A single
@@ -29,7 +36,29 @@ Data sources
 Auth
 ----
 ``GH_PAT`` / ``GITHUB_TOKEN`` / ``GH_TOKEN`` from the environment. Without a
-token the script falls back to public data for ``USERNAME``.
+token the script falls back to public data for ``USERNAME``. Extra tokens
+in ``GH_PATS`` (comma-separated) are rotated for the per-repo
+``/repos/:o/:r/...`` calls: each goes out on the token with the most
+rate-limit budget left. Viewer-scoped calls (the GraphQL ``viewer`` listing,
+``/user/repos``) always use the first token, since their results and
+cursors belong to that token's account. Rate limits are per account, so
+``GH_PATS`` only adds budget when its tokens belong to other accounts.
+
+Caching
+-------
+Both caches live in ``CACHE_DIR`` and are pruned to the repos still listed.
+
+* ``REPO_CACHE_FILE`` — the per-repo stats that cost API calls (commit
+  total, lifespan, team size) keyed by ``owner/name@pushed_at``. A repo that
+  hasn't been pushed to since the last run can't have new commits or
+  contributors, so those come from the cache. Size, language and the rest
+  are free in the listing and always taken from the current run, since
+  GitHub recomputes them lazily after a push.
+* ``ETAG_CACHE_FILE`` — REST GETs are sent as conditional requests; a
+  ``304 Not Modified`` (which GitHub does not charge against the rate
+  limit) replays the cached body. Authenticated ``/user/...`` responses are
+  never written out: they list private repos, and the cache directory is
+  stored in this public repo's Actions cache.
 
 Output
 ------
@@ -40,32 +69,54 @@ survive GitHub's markdown renderer. This is really killing my creativity though.
 from __future__ import annotations
 
 import argparse
+import json
 import os
 import re
 import sys
+import threading
+import time
 import unicodedata
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from datetime import date, datetime, timezone
-from typing import Callable, List, Optional, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 try:
     import wcwidth as _wcwidth
 except ImportError:  # pragma: no cover - fallback tested via wcswidth()
     _wcwidth = None
 
+try:
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - stdlib json fallback
+    _orjson = None
+
 
 # Config variables
 USERNAME = "chasenunez"
 ACTIVE_WINDOW_DAYS = 90         
 LINE_LENGTH = 112                 # target width of the rendered dashboard, not really sure why it is this width, but it is what fits before the scrollbars pop up
 README_OUT = "README.md"
+CACHE_DIR = ".cache"
+ETAG_CACHE_FILE = "etag_cache.json"
+REPO_CACHE_FILE = "repo_cache.json"
 
 # Network tuning.
 GITHUB_REST = "https://api.github.com"
+GITHUB_GRAPHQL = "https://api.github.com/graphql"
 HTTP_TIMEOUT = 30
+HTTP_RETRIES = 3                  # transport-level retries for 502/503/504 and dropped connections
 METADATA_WORKERS = 8              # concurrent repos processed at once. 5-8 seems to work best.
+OLDEST_COMMIT_BATCH = 20          # aliased repository() lookups per GraphQL query
+RATE_LIMIT_FLOOR = 10             # pause every worker until reset below this many calls left
+RATE_LIMIT_RETRIES = 3            # retries for 403/429 rate-limit responses
+RATE_LIMIT_BACKOFF = 2.0          # seconds; doubled on each retry
+MAX_RATE_LIMIT_WAIT = 300         # longest single pause; a later reset fails fast instead
+SECONDARY_RATE_LIMIT_WAIT = 60    # GitHub's advice when a secondary limit has no Retry-After
 
 
 # Display-width helpers
@@ -108,18 +159,35 @@ def pad_to_width(s: str, target: int, align: str = "left") -> str:
         return ""
     if target == 1:
         return s[:1]
-    acc, out = 0, ""
-    for ch in s:
+    # Find the cut point first, then build the result with one slice.
+    acc, cut = 0, 0
+    for i, ch in enumerate(s):
         w = max(1, wcswidth(ch))
         if acc + w > target - 1:
             break
-        out += ch
         acc += w
-    out += "…"
-    acc += 1
-    if acc < target:
-        out += " " * (target - acc)
-    return out
+        cut = i + 1
+    return s[:cut] + "…" + " " * max(0, target - acc - 1)
+
+
+# JSON — orjson when installed, stdlib otherwise
+def json_loads(data):
+    """Decode JSON from ``bytes``/``str``; raises ``ValueError`` on bad input."""
+    if _orjson is not None:
+        return _orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj) -> bytes:
+    """Encode ``obj`` as compact UTF-8 JSON bytes."""
+    if _orjson is not None:
+        return _orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def resp_json(r: requests.Response):
+    """Drop-in for ``r.json()`` that goes through :func:`json_loads`."""
+    return json_loads(r.content)
 
 
 # HTTP / auth
@@ -132,8 +200,255 @@ def auth_token() -> Optional[str]:
     return None
 
 
-def make_session(token: Optional[str]) -> requests.Session:
-    """Create a ``requests.Session`` with 'sensible' defaults for the GH API."""
+def auth_tokens() -> List[str]:
+    """Return every distinct token: :func:`auth_token` first, then ``GH_PATS``."""
+    tokens: List[str] = []
+    first = auth_token()
+    for t in [first or ""] + os.environ.get("GH_PATS", "").split(","):
+        t = t.strip()
+        if t and t not in tokens:
+            tokens.append(t)
+    return tokens
+
+
+_SECONDARY_LIMIT_RE = re.compile(rb"secondary rate limit|abuse detection", re.IGNORECASE)
+
+
+def rate_limit_delay(status: int, headers, attempt: int,
+                     now: Optional[float] = None, body: bytes = b"") -> Optional[float]:
+    """Seconds to wait before retrying a rate-limited response, else ``None``.
+
+    Honors ``Retry-After`` (secondary limits) and an exhausted
+    ``X-RateLimit-Remaining`` (primary limit), never waiting less than the
+    exponential backoff for ``attempt``. A secondary-limit 403 without
+    ``Retry-After`` is recognised by its ``body`` and waits at least
+    ``SECONDARY_RATE_LIMIT_WAIT``. A plain 403 (permissions) is not retried.
+    """
+    if status not in (403, 429):
+        return None
+    now = time.time() if now is None else now
+    backoff = RATE_LIMIT_BACKOFF * 2 ** attempt
+    retry_after = headers.get("Retry-After")
+    if retry_after is not None:
+        try:
+            return max(float(retry_after), backoff)
+        except ValueError:
+            return backoff
+    if headers.get("X-RateLimit-Remaining") == "0":
+        try:
+            return max(float(headers.get("X-RateLimit-Reset", 0)) - now, backoff)
+        except ValueError:
+            return backoff
+    if status == 403 and _SECONDARY_LIMIT_RE.search(body or b""):
+        return max(float(SECONDARY_RATE_LIMIT_WAIT), backoff)
+    return backoff if status == 429 else None
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """Transport adapter that paces every worker sharing the session.
+
+    The last ``X-RateLimit-Remaining`` / ``-Reset`` seen is tracked per token
+    and per API (REST ``core`` vs ``graphql``). Per-repo REST requests go out
+    on the token with the most budget left; everything else (the viewer-scoped
+    listings) stays on the first token so paging never switches accounts.
+    Once every candidate token is below ``RATE_LIMIT_FLOOR`` the request
+    waits for the earliest reset, unless that is more than
+    ``MAX_RATE_LIMIT_WAIT`` away: then it goes out anyway, and once the
+    budget is gone the rate-limited response is returned without retrying. With no ``tokens`` the run is
+    unauthenticated: its 60 calls/hour aren't worth waiting for, so there is
+    no floor and an exhausted budget is returned to the caller, not retried.
+    403/429 rate-limit responses are retried per :func:`rate_limit_delay`.
+    Pauses are capped at ``MAX_RATE_LIMIT_WAIT`` seconds.
+    """
+
+    def __init__(self, *args, tokens: Sequence[str] = (),
+                 rate_limit_retries: int = RATE_LIMIT_RETRIES, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rate_limit_retries = rate_limit_retries
+        self.tokens: List[Optional[str]] = list(tokens) or [None]
+        # (token, api) -> (remaining, reset epoch); absent = not seen yet.
+        self._budget: Dict[Tuple[Optional[str], str], Tuple[int, float]] = {}
+        self._resume_at = 0.0
+        self._gate = threading.Lock()
+
+    @staticmethod
+    def _api(request) -> str:
+        return "graphql" if request.url.startswith(GITHUB_GRAPHQL) else "core"
+
+    @staticmethod
+    def _rotates(request) -> bool:
+        """Only per-repo REST calls answer the same on any account's token."""
+        return request.url.startswith(f"{GITHUB_REST}/repos/")
+
+    def _pause_until(self, ts: float) -> None:
+        with self._gate:
+            cap = time.time() + MAX_RATE_LIMIT_WAIT
+            self._resume_at = max(self._resume_at, min(ts, cap))
+
+    def pick_token(self, api: str, rotate: bool = True) -> Tuple[Optional[str], float]:
+        """Return ``(token, seconds_to_wait)`` for the next ``api`` request.
+
+        Without ``rotate`` the first (primary) token is always returned.
+        """
+        now = time.time()
+        pool = self.tokens if rotate else self.tokens[:1]
+        with self._gate:
+            def left(t: Optional[str]) -> float:
+                remaining, reset = self._budget.get((t, api), (None, 0.0))
+                return float("inf") if remaining is None or reset <= now else remaining
+
+            token = max(pool, key=left)
+            wait = 0.0
+            if token is not None and left(token) < RATE_LIMIT_FLOOR:
+                token = min(pool, key=lambda t: self._budget[(t, api)][1])
+                wait = self._budget[(token, api)][1] - now
+            wait = max(wait, self._resume_at - now)
+        return token, max(0.0, wait)
+
+    def _record(self, token: Optional[str], api: str, headers) -> None:
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is None or not remaining.isdigit():
+            return
+        try:
+            reset = float(headers.get("X-RateLimit-Reset", 0))
+        except ValueError:
+            reset = 0.0
+        with self._gate:
+            self._budget[(token, api)] = (int(remaining), reset)
+
+    def send(self, request, **kwargs):
+        if not request.url.startswith(GITHUB_REST):
+            # e.g. a redirect to another host: requests has already stripped
+            # Authorization, and no token may be put back on it here.
+            return super().send(request, **kwargs)
+        api, rotate = self._api(request), self._rotates(request)
+        attempt = 0
+        resp = None
+        while True:
+            token, wait = self.pick_token(api, rotate)
+            if wait > MAX_RATE_LIMIT_WAIT:
+                # The reset is too far off to wait for: fail fast with the
+                # last rate-limited response, or spend what budget is left.
+                if resp is not None:
+                    return resp
+                wait = 0.0
+            if wait > 0:
+                time.sleep(wait)
+            if token is not None:
+                request.headers["Authorization"] = f"token {token}"
+            resp = super().send(request, **kwargs)
+            self._record(token, api, resp.headers)
+            body = resp.content if resp.status_code in (403, 429) else b""
+            delay = rate_limit_delay(resp.status_code, resp.headers, attempt, body=body)
+            exhausted = resp.headers.get("X-RateLimit-Remaining") == "0"
+            if delay is None or attempt >= self.rate_limit_retries or (exhausted and token is None):
+                return resp
+            resp.close()
+            if not exhausted:
+                # Secondary limit: applies to the whole client, not one token.
+                # (An exhausted primary budget is handled by pick_token.)
+                self._pause_until(time.time() + delay)
+            attempt += 1
+
+
+class ETagCacheAdapter(RateLimitedAdapter):
+    """Transport adapter that turns repeat GETs into conditional requests.
+
+    ``entries`` maps a full URL to ``{"etag", "body", "link"}`` from a previous
+    run. Matching GETs carry ``If-None-Match``; a ``304`` is rewritten into a
+    ``200`` with the cached body and ``Link`` header, so callers (pagination,
+    the ``rel=last`` tricks) can't tell the difference.
+    """
+
+    def __init__(self, entries: Optional[dict] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.entries = dict(entries or {})
+        self.used: dict = {}  # entries hit or refreshed this run
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        if request.method != "GET":
+            return super().send(request, **kwargs)
+        cached = self.entries.get(request.url)
+        if cached and cached.get("etag"):
+            request.headers["If-None-Match"] = cached["etag"]
+        resp = super().send(request, **kwargs)
+
+        if cached and resp.status_code == 304:
+            resp.content  # drain the empty body so the connection is released
+            resp.status_code = 200
+            resp._content = cached["body"].encode("utf-8")
+            resp.encoding = "utf-8"
+            if cached.get("link"):
+                resp.headers["Link"] = cached["link"]
+            entry = cached
+        elif resp.status_code == 200 and resp.headers.get("ETag"):
+            entry = {
+                "etag": resp.headers["ETag"],
+                "body": resp.content.decode("utf-8", "replace"),
+                "link": resp.headers.get("Link", ""),
+            }
+        else:
+            return resp
+        with self._lock:
+            self.used[request.url] = entry
+        return resp
+
+
+def load_json_cache(path: str) -> dict:
+    """Read a cache written by :func:`save_json_cache` (``{}`` if absent)."""
+    try:
+        with open(path, "rb") as fh:
+            data = json_loads(fh.read())
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save_json_cache(path: str, entries: dict) -> None:
+    """Atomically write ``entries`` to ``path``, creating its directory."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(json_dumps(entries))
+    os.replace(tmp, path)
+
+
+def shareable_etag_entries(entries: dict) -> dict:
+    """Drop ETag entries for viewer-scoped ``/user/...`` URLs before saving.
+
+    Those bodies (the authenticated repo listing) include private repos.
+    """
+    private = f"{GITHUB_REST}/user/"
+    return {url: e for url, e in entries.items() if not url.startswith(private)}
+
+
+def etag_entries_to_save(used: dict, previous: dict,
+                         idle: Sequence[RepoLite]) -> dict:
+    """This run's ETag entries plus the previous run's for ``idle`` repos.
+
+    A repo served from the repo cache makes no REST calls, so its
+    ``/repos/:o/:r/...`` entries would otherwise be dropped and the next
+    fetch after a push would be a full 200 instead of a free 304.
+    """
+    prefixes = tuple(f"{GITHUB_REST}/repos/{r.owner}/{r.name}/" for r in idle)
+    entries = {url: e for url, e in previous.items() if prefixes and url.startswith(prefixes)}
+    entries.update(used)
+    return shareable_etag_entries(entries)
+
+
+def make_session(token: Optional[str],
+                 etag_cache: Optional[dict] = None, *,
+                 pool_size: int = METADATA_WORKERS,
+                 tokens: Sequence[str] = ()) -> requests.Session:
+    """Create a ``requests.Session`` with 'sensible' defaults for the GH API.
+
+    ``https://`` is always served by a :class:`RateLimitedAdapter`; passing
+    ``etag_cache`` (possibly empty) upgrades it to an :class:`ETagCacheAdapter`.
+    The adapter keeps up to ``pool_size`` keep-alive connections — one per
+    metadata worker — and retries transient 5xx/connection errors. Several
+    ``tokens`` are rotated across per-repo requests by the adapter.
+    """
     s = requests.Session()
     s.headers.update({
         "Accept": "application/vnd.github.v3+json",
@@ -141,6 +456,23 @@ def make_session(token: Optional[str]) -> requests.Session:
     })
     if token:
         s.headers["Authorization"] = f"token {token}"
+    adapter_kwargs = {
+        "tokens": list(tokens) or ([token] if token else []),
+        "pool_maxsize": max(1, pool_size),
+        "max_retries": Retry(
+            total=HTTP_RETRIES, backoff_factor=0.5,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({"GET", "POST"}),  # our POSTs are GraphQL reads
+            raise_on_status=False,  # hand the last response to raise_for_status()
+            # Rate-limit (Retry-After) retries belong to the adapter alone,
+            # where they are paced per token and capped.
+            respect_retry_after_header=False,
+        ),
+    }
+    if etag_cache is not None:
+        s.mount("https://", ETagCacheAdapter(etag_cache, **adapter_kwargs))
+    else:
+        s.mount("https://", RateLimitedAdapter(**adapter_kwargs))
     return s
 
 
@@ -152,35 +484,40 @@ def gh_get(session: requests.Session, url: str,
     return r
 
 
-def gh_paginated(session: requests.Session, url: str,
-                 params: Optional[dict] = None) -> List[dict]:
-    """Follow ``Link: rel="next"`` pagination and return a flat list."""
-    items: List[dict] = []
+def iter_paginated(session: requests.Session, url: str,
+                   params: Optional[dict] = None) -> Iterator[dict]:
+    """Follow ``Link: rel="next"`` pagination, yielding items one at a time.
+
+    Pages are fetched lazily: the next request is only made once the caller
+    has consumed the current page, so breaking out of the loop early skips
+    the remaining pages entirely.
+    """
     params = dict(params or {})
     params.setdefault("per_page", 100)
     next_url: Optional[str] = url
     cur_params: Optional[dict] = params
     while next_url:
         r = gh_get(session, next_url, params=cur_params)
-        data = r.json()
+        data = resp_json(r)
         if not isinstance(data, list):
             break
-        items.extend(data)
-        m = _LINK_NEXT_RE.search(r.headers.get("Link", ""))
-        next_url = m.group(1) if m else None
+        yield from data
+        next_url = _parse_links(r).get("next")
         cur_params = None  # the next URL already encodes its own params
-    return items
 
 
 # Link-header helpers — cheap "count" and "oldest item" via rel="last"
-_LINK_NEXT_RE = re.compile(r'<([^>]+)>;\s*rel="next"')
-_LINK_LAST_RE = re.compile(r'<([^>]+)>;\s*rel="last"')
+_LINK_RE = re.compile(r'<([^>]+)>;\s*rel="([^"]+)"')
 _PAGE_PARAM_RE = re.compile(r'[?&]page=(\d+)')
 
 
+def _parse_links(resp: requests.Response) -> Dict[str, str]:
+    """Parse the ``Link`` header once into a ``{rel: url}`` map."""
+    return {rel: url for url, rel in _LINK_RE.findall(resp.headers.get("Link", ""))}
+
+
 def _link_last_url(resp: requests.Response) -> Optional[str]:
-    m = _LINK_LAST_RE.search(resp.headers.get("Link", ""))
-    return m.group(1) if m else None
+    return _parse_links(resp).get("last")
 
 
 def _link_last_page(resp: requests.Response) -> Optional[int]:
@@ -197,35 +534,212 @@ def _link_last_page(resp: requests.Response) -> Optional[int]:
         return None
 
 
-def count_via_link(session: requests.Session, url: str) -> int:
+def count_via_link(session: requests.Session, url: str) -> Optional[int]:
     """Approximate item count using ``per_page=1`` + ``rel=last``.
 
-    This is O(1) API calls regardless of how many items exist
+    This is O(1) API calls regardless of how many items exist. Returns
+    ``None`` if the request fails, so callers can tell "unknown" from 0.
     """
     try:
         r = gh_get(session, url, params={"per_page": 1})
     except requests.RequestException:
-        return 0
+        return None
     last_page = _link_last_page(r)
     if last_page is not None:
         return last_page
     # No rel=last means the response fits on a single page.
     try:
-        data = r.json()
+        data = resp_json(r)
         return len(data) if isinstance(data, list) else 0
     except (requests.RequestException, ValueError):
-        return 0
+        return None
 
 
 # Data fetching
-def fetch_repos(session: requests.Session, token: Optional[str]) -> List[dict]:
-    """Return the user's repos sorted by most recently pushed."""
+@dataclass(slots=True)
+class RepoLite:
+    """The handful of listing fields the pipeline uses, for either API.
+
+    ``languages`` / ``commit_total`` / ``last_commit`` / ``head_oid`` are
+    prefetched by the GraphQL listing and ``first_commit`` by
+    :func:`fetch_first_commits_graphql`; ``None`` means :func:`build_repo_rows`
+    must ask REST. ``commit_total`` is 0 for an empty repo (no default branch).
+    """
+    name: str
+    owner: str
+    private: bool
+    pushed_at: str
+    html_url: str
+    size: int
+    language: str
+    languages: Optional[Dict[str, int]] = None
+    commit_total: Optional[int] = None
+    last_commit: Optional[str] = None
+    head_oid: Optional[str] = None
+    first_commit: Optional[str] = None
+
+    @classmethod
+    def from_rest(cls, r: dict) -> RepoLite:
+        """Build from a REST ``/user/repos`` (or ``/users/:u/repos``) item."""
+        return cls(
+            name=r.get("name") or "",
+            owner=(r.get("owner") or {}).get("login") or "",
+            private=bool(r.get("private")),
+            pushed_at=r.get("pushed_at") or r.get("updated_at") or "",
+            html_url=r.get("html_url") or "",
+            size=int(r.get("size") or 0),
+            language=r.get("language") or "",
+        )
+
+
+def fetch_repos(session: requests.Session, token: Optional[str], *,
+                pushed_after: Optional[float] = None) -> List[RepoLite]:
+    """Return the user's repos sorted by most recently pushed.
+
+    With ``pushed_after`` (epoch seconds) the listing stops at the first
+    older repo — everything after it is older still, so no further pages
+    are requested.
+    """
     url = f"{GITHUB_REST}/user/repos" if token else f"{GITHUB_REST}/users/{USERNAME}/repos"
-    repos = gh_paginated(session, url, params={"sort": "pushed", "direction": "desc"})
-    repos.sort(key=lambda r: r.get("pushed_at") or "", reverse=True)
+    # The API already returns sort=pushed/desc order; no client-side re-sort.
+    repos: List[RepoLite] = []
+    for item in iter_paginated(session, url, params={"sort": "pushed", "direction": "desc"}):
+        r = RepoLite.from_rest(item)
+        if pushed_after is not None and _pushed_before(r, pushed_after):
+            break
+        repos.append(r)
     return repos
 
 
+# GraphQL — one query per 100 repos instead of 2-3 REST calls per repo
+_REPOS_QUERY = """
+query($cursor: String) {
+  viewer {
+    repositories(first: 100, after: $cursor,
+                 ownerAffiliations: [OWNER, COLLABORATOR, ORGANIZATION_MEMBER],
+                 orderBy: {field: PUSHED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        name url isPrivate pushedAt updatedAt diskUsage
+        owner { login }
+        primaryLanguage { name }
+        languages(first: 20, orderBy: {field: SIZE, direction: DESC}) {
+          edges { size node { name } }
+        }
+        defaultBranchRef {
+          target {
+            ... on Commit {
+              oid
+              history(first: 1) { totalCount nodes { authoredDate } }
+            }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+
+def _repo_from_graphql(node: dict) -> RepoLite:
+    """Build a :class:`RepoLite` (with prefetched metrics) from a GraphQL node."""
+    langs = {
+        e["node"]["name"]: int(e.get("size") or 0)
+        for e in ((node.get("languages") or {}).get("edges") or [])
+    }
+    target = (node.get("defaultBranchRef") or {}).get("target") or {}
+    history = target.get("history") or {}
+    newest = history.get("nodes") or []
+    return RepoLite(
+        name=node.get("name") or "",
+        owner=(node.get("owner") or {}).get("login") or "",
+        private=bool(node.get("isPrivate")),
+        pushed_at=node.get("pushedAt") or node.get("updatedAt") or "",
+        html_url=node.get("url") or "",
+        size=int(node.get("diskUsage") or 0),
+        language=(node.get("primaryLanguage") or {}).get("name") or "",
+        languages=langs,
+        commit_total=int(history.get("totalCount") or 0),
+        last_commit=newest[0].get("authoredDate") if newest else None,
+        head_oid=target.get("oid"),
+    )
+
+
+def fetch_repos_graphql(session: requests.Session, *,
+                        pushed_after: Optional[float] = None) -> List[RepoLite]:
+    """Return the viewer's repos (most recently pushed first) via GraphQL.
+
+    Requires a token. Raises ``RuntimeError`` if the response carries
+    GraphQL-level errors so the caller can fall back to REST. ``pushed_after``
+    stops paging early, as in :func:`fetch_repos`.
+    """
+    repos: List[RepoLite] = []
+    cursor: Optional[str] = None
+    while True:
+        r = session.post(GITHUB_GRAPHQL, timeout=HTTP_TIMEOUT,
+                         json={"query": _REPOS_QUERY, "variables": {"cursor": cursor}})
+        r.raise_for_status()
+        payload = resp_json(r)
+        if payload.get("errors"):
+            raise RuntimeError(f"GraphQL error: {payload['errors'][0].get('message')}")
+        conn = payload["data"]["viewer"]["repositories"]
+        batch = [_repo_from_graphql(n) for n in conn.get("nodes") or [] if n]
+        repos.extend(batch)
+        page = conn.get("pageInfo") or {}
+        if not page.get("hasNextPage"):
+            return repos
+        if pushed_after is not None and batch and _pushed_before(batch[-1], pushed_after):
+            return repos
+        cursor = page.get("endCursor")
+
+
+def _first_commit_query(chunk: List[RepoLite]) -> Tuple[str, dict]:
+    """Build one aliased query asking each repo in ``chunk`` for its oldest commit.
+
+    A history cursor is ``"<head oid> <offset>"``, so ``first: 1`` after
+    offset ``total - 2`` is the last (oldest) commit in the same order the
+    REST ``page=total`` lookup uses.
+    """
+    decls, fields, variables = [], [], {}
+    for j, r in enumerate(chunk):
+        decls.append(f"$o{j}: String!, $n{j}: String!, $c{j}: String!")
+        fields.append(
+            f"r{j}: repository(owner: $o{j}, name: $n{j}) {{ defaultBranchRef {{ target {{ "
+            f"... on Commit {{ history(first: 1, after: $c{j}) {{ nodes {{ authoredDate }} }} }}"
+            f" }} }} }}"
+        )
+        variables.update({f"o{j}": r.owner, f"n{j}": r.name,
+                          f"c{j}": f"{r.head_oid} {r.commit_total - 2}"})
+    return f"query({', '.join(decls)}) {{\n  " + "\n  ".join(fields) + "\n}", variables
+
+
+def fetch_first_commits_graphql(session: requests.Session,
+                                repos: List[RepoLite]) -> None:
+    """Fill ``first_commit`` in place, ``OLDEST_COMMIT_BATCH`` repos per query.
+
+    Only repos from the GraphQL listing with more than one commit qualify.
+    Anything that fails (whole query or a single alias) keeps
+    ``first_commit=None`` and falls back to :func:`fetch_first_commit_date`.
+    """
+    todo = [r for r in repos if r.head_oid and (r.commit_total or 0) > 1]
+    for i in range(0, len(todo), OLDEST_COMMIT_BATCH):
+        chunk = todo[i:i + OLDEST_COMMIT_BATCH]
+        query, variables = _first_commit_query(chunk)
+        try:
+            r = session.post(GITHUB_GRAPHQL, timeout=HTTP_TIMEOUT,
+                             json={"query": query, "variables": variables})
+            r.raise_for_status()
+            data = resp_json(r).get("data") or {}
+        except (requests.RequestException, ValueError, AttributeError):
+            continue
+        for j, repo in enumerate(chunk):
+            target = (((data.get(f"r{j}") or {}).get("defaultBranchRef") or {})
+                      .get("target") or {})
+            nodes = (target.get("history") or {}).get("nodes") or []
+            if nodes:
+                repo.first_commit = nodes[0].get("authoredDate")
+
+
 def _parse_github_ts(ts: str) -> Optional[datetime]:
     """Parse a GitHub ISO-8601 timestamp (``Z``-suffixed) to an aware datetime."""
     if not ts:
@@ -236,47 +750,78 @@ def _parse_github_ts(ts: str) -> Optional[datetime]:
         return None
 
 
-def filter_recently_active(repos: List[dict], *, now: datetime,
-                           window_days: int) -> List[dict]:
+def _pushed_before(r: RepoLite, cutoff: float) -> bool:
+    """True if ``r`` has a timestamp and it is older than ``cutoff`` (epoch)."""
+    ts = _parse_github_ts(r.pushed_at)
+    return ts is not None and ts.timestamp() < cutoff
+
+
+def window_cutoff(now: datetime, window_days: int) -> float:
+    """Epoch seconds of the oldest push still inside the activity window."""
+    return now.timestamp() - window_days * 86400
+
+
+def filter_recently_active(repos: List[RepoLite], *, now: datetime,
+                           window_days: int) -> List[RepoLite]:
     """Return repos whose ``pushed_at`` falls within ``window_days`` of ``now``."""
-    cutoff = now.timestamp() - window_days * 86400
-    out: List[dict] = []
+    cutoff = window_cutoff(now, window_days)
+    out: List[RepoLite] = []
     for r in repos:
-        ts = _parse_github_ts(r.get("pushed_at") or r.get("updated_at") or "")
+        ts = _parse_github_ts(r.pushed_at)
         if ts is not None and ts.timestamp() >= cutoff:
             out.append(r)
     return out
 
 
+def _largest_non_html(langs: dict) -> Optional[str]:
+    """Return the largest non-HTML language in a ``{lang: bytes}`` map."""
+    candidates = ((b, lang) for lang, b in langs.items()
+                  if lang.strip().lower() != "html")
+    best = max(candidates, default=None, key=lambda bl: bl[0])
+    return best[1] if best else None
+
+
 def fetch_non_html_primary(session: requests.Session, owner: str, repo: str
                            ) -> Optional[str]:
-    """Return the largest non-HTML language, or ``None`` if none exists."""
+    """Return the largest non-HTML language.
+
+    ``""`` means the repo has no non-HTML language; ``None`` means the lookup
+    failed.
+    """
     try:
         r = gh_get(session, f"{GITHUB_REST}/repos/{owner}/{repo}/languages")
-        langs = r.json()
+        langs = resp_json(r)
     except (requests.RequestException, ValueError):
         return None
     if not isinstance(langs, dict):
         return None
-    for lang, _ in sorted(langs.items(), key=lambda kv: kv[1], reverse=True):
-        if lang.strip().lower() != "html":
-            return lang
-    return None
+    return _largest_non_html(langs) or ""
+
+
+def _iso_date(iso: Optional[str]) -> Optional[date]:
+    """Convert a GitHub ISO-8601 timestamp to a ``date`` (``None`` if invalid)."""
+    if not iso:
+        return None
+    try:
+        if iso.endswith("Z"):
+            # Canonical ``YYYY-MM-DDTHH:MM:SSZ``: already UTC, so the date is
+            # just the first ten characters — no datetime object needed.
+            return date.fromisoformat(iso[:10])
+        return datetime.fromisoformat(iso).date()
+    except (ValueError, AttributeError, TypeError):
+        return None
 
 
 def _commit_author_date(commit: dict) -> Optional[date]:
     """Extract the author date from a REST commit object as a ``date``."""
     try:
-        iso = (((commit.get("commit") or {}).get("author") or {}).get("date") or "")
-        if not iso:
-            return None
-        return datetime.fromisoformat(iso.replace("Z", "+00:00")).date()
-    except (ValueError, AttributeError):
+        return _iso_date(((commit.get("commit") or {}).get("author") or {}).get("date"))
+    except AttributeError:
         return None
 
 
 def fetch_commit_stats(session: requests.Session, owner: str, repo: str
-                       ) -> Tuple[int, Optional[date], Optional[date]]:
+                       ) -> Tuple[Optional[int], Optional[date], Optional[date]]:
     """Return ``(total_commits, first_commit_date, last_commit_date)``.
 
     Strategy:
@@ -288,20 +833,22 @@ def fetch_commit_stats(session: requests.Session, owner: str, repo: str
            *oldest*, because per_page=1 is preserved in the Link URL.
 
     Both dates come back as ``date`` objects in UTC.  Returns ``None`` for
-    any field that couldn't be determined (empty repo, 409, network error).
+    any field that couldn't be determined. A total of exactly 0 means the
+    repo is known to be empty (409 Conflict); ``None`` means "unknown".
     """
     url = f"{GITHUB_REST}/repos/{owner}/{repo}/commits"
     try:
         r = gh_get(session, url, params={"per_page": 1})
-    except requests.HTTPError:
-        # 409 Conflict = empty repo; any other error is treated as "unknown".
-        return 0, None, None
+    except requests.HTTPError as exc:
+        if exc.response is not None and exc.response.status_code == 409:
+            return 0, None, None
+        return None, None, None
     except requests.RequestException:
-        return 0, None, None
+        return None, None, None
 
     # Newest commit is in the body of the first request.
     try:
-        first_page = r.json()
+        first_page = resp_json(r)
     except (requests.RequestException, ValueError):
         first_page = None
     last_date = (_commit_author_date(first_page[0])
@@ -317,7 +864,7 @@ def fetch_commit_stats(session: requests.Session, owner: str, repo: str
     total = _link_last_page(r) or 1
     try:
         r_last = gh_get(session, last_url)
-        data = r_last.json()
+        data = resp_json(r_last)
     except (requests.RequestException, ValueError):
         return total, None, last_date
     first_date = (_commit_author_date(data[0])
@@ -325,37 +872,95 @@ def fetch_commit_stats(session: requests.Session, owner: str, repo: str
     return total, first_date, last_date
 
 
-def fetch_team_size(session: requests.Session, owner: str, repo: str) -> int:
-    """Count unique contributors via the Link ``rel=last`` trick."""
+def fetch_first_commit_date(session: requests.Session, owner: str, repo: str,
+                            total: int) -> Optional[date]:
+    """Return the oldest commit's date given the known commit ``total``.
+
+    With ``per_page=1`` page *N* of ``/commits`` is the *N*-th newest commit,
+    so ``page=total`` is the oldest — one round trip, no Link parsing.
+    """
+    try:
+        r = gh_get(session, f"{GITHUB_REST}/repos/{owner}/{repo}/commits",
+                   params={"per_page": 1, "page": total})
+        data = resp_json(r)
+    except (requests.RequestException, ValueError):
+        return None
+    return _commit_author_date(data[0]) if isinstance(data, list) and data else None
+
+
+def fetch_team_size(session: requests.Session, owner: str, repo: str) -> Optional[int]:
+    """Count unique contributors via the Link ``rel=last`` trick (``None`` on failure)."""
     return count_via_link(session, f"{GITHUB_REST}/repos/{owner}/{repo}/contributors")
 
 
 # Row building — one concurrent worker per repo
-def build_repo_rows(session: requests.Session, repos: List[dict],
-                    *, max_workers: int = METADATA_WORKERS) -> List[dict]:
+_CACHED_STATS = ("commits", "lifespan_days", "team_size")  # the row fields that cost API calls
+
+
+def repo_cache_key(r: RepoLite) -> Optional[str]:
+    """``owner/name@pushed_at`` — changes whenever the repo's data can change."""
+    if not (r.owner and r.name and r.pushed_at):
+        return None
+    return f"{r.owner}/{r.name}@{r.pushed_at}"
+
+
+def build_repo_rows(session: requests.Session, repos: List[RepoLite],
+                    *, max_workers: int = METADATA_WORKERS,
+                    cache: Optional[dict] = None) -> List[dict]:
     """Fetch per-repo metadata concurrently and return render-ready rows.
 
     Each returned dict has the keys consumed by :func:`render_repo_table`:
     ``name_text``, ``name_url``, ``language``, ``size``, ``commits``,
     ``lifespan_days``, ``team_size``, ``private``.
 
+    ``cache`` maps :func:`repo_cache_key` to the row's ``_CACHED_STATS``;
+    hits skip the commit and contributor requests, and fully fetched stats
+    are added to it. The remaining fields always come from ``repos``.
+
     Failed repos are dropped
     """
     if not repos:
         return []
 
-    def one(r: dict) -> Optional[dict]:
-        owner = (r.get("owner") or {}).get("login")
-        name = r.get("name") or ""
+    def one(r: RepoLite, cached: Optional[dict]) -> Tuple[Optional[dict], Optional[dict]]:
+        """Return ``(row, stats)``; ``stats`` is ``None`` unless fetched in full."""
+        owner, name = r.owner, r.name
         if not owner or not name:
-            return None
+            return None, None
 
-        language = r.get("language") or ""
+        language = r.language
         if language.strip().lower() == "html":
-            language = fetch_non_html_primary(session, owner, name) or language
-
-        commits, first_date, last_date = fetch_commit_stats(session, owner, name)
-        team_size = fetch_team_size(session, owner, name)
+            if r.languages is not None:
+                language = _largest_non_html(r.languages) or language
+            else:
+                language = fetch_non_html_primary(session, owner, name) or language
+        row = {
+            "owner": owner,
+            "name_text": name,
+            "name_url": r.html_url,
+            "language": language or "—",
+            "size": r.size,
+            "private": r.private,
+        }
+        if cached is not None:
+            row.update((k, cached.get(k)) for k in _CACHED_STATS)
+            return row, None
+
+        if r.commit_total is not None:
+            # GraphQL already gave us the total and the newest commit; only
+            # the oldest commit still needs a REST call.
+            commits = r.commit_total
+            last_date = _iso_date(r.last_commit)
+            if commits <= 1:
+                first_date = last_date
+            elif r.first_commit:
+                first_date = _iso_date(r.first_commit)
+            else:
+                first_date = fetch_first_commit_date(session, owner, name, commits)
+        else:
+            commits, first_date, last_date = fetch_commit_stats(session, owner, name)
+        # An empty repo has no contributors either; don't spend a call on it.
+        team_size = fetch_team_size(session, owner, name) if commits != 0 else 0
         # Lifespan = span of activity = last_commit - first_commit. A single-
         # commit repo therefore has lifespan 0 (rendered as "<1 d").
         if first_date and last_date:
@@ -363,27 +968,34 @@ def build_repo_rows(session: requests.Session, repos: List[dict],
         else:
             lifespan = None
 
-        return {
-            "owner": owner,
-            "name_text": name,
-            "name_url": r.get("html_url", ""),
-            "language": language or "—",
-            "size": int(r.get("size") or 0),
-            "commits": commits,
-            "lifespan_days": lifespan,
-            "team_size": team_size,
-            "private": bool(r.get("private")),
-        }
+        stats = {"commits": commits or 0, "lifespan_days": lifespan,
+                 "team_size": team_size or 0}
+        row.update(stats)
+        # Any failed lookup leaves the stats out of the cache so they are
+        # retried next run instead of being frozen until the repo's next push.
+        complete = (
+            team_size is not None and commits is not None
+            and (commits == 0 or lifespan is not None)
+        )
+        return row, stats if complete else None
 
     rows: List[Optional[dict]] = [None] * len(repos)
+    keys = [repo_cache_key(r) for r in repos]
     workers = max(1, min(max_workers, len(repos)))
     with ThreadPoolExecutor(max_workers=workers) as ex:
-        futures = {ex.submit(one, r): i for i, r in enumerate(repos)}
+        futures = {
+            ex.submit(one, r, cache.get(key) if cache is not None and key else None): i
+            for i, (r, key) in enumerate(zip(repos, keys))
+        }
         for fut in as_completed(futures):
+            i = futures[fut]
             try:
-                rows[futures[fut]] = fut.result()
+                row, stats = fut.result()
             except (requests.RequestException, ValueError, KeyError, RuntimeError):
-                pass
+                continue
+            rows[i] = row
+            if cache is not None and stats is not None and keys[i]:
+                cache[keys[i]] = stats
     return [r for r in rows if r]
 
 
@@ -554,39 +1166,73 @@ def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
                    help="Print the rendered README to stdout instead of writing.")
     p.add_argument("--window-days", type=int, default=ACTIVE_WINDOW_DAYS,
                    help="Only list repos pushed within this many days.")
+    p.add_argument("--workers", type=int, default=METADATA_WORKERS,
+                   help="Repos whose metadata is fetched concurrently.")
+    p.add_argument("--cache-dir", default=CACHE_DIR,
+                   help="Directory for the repo-row and ETag caches ('' disables).")
     return p.parse_args(argv)
 
 
 def main(argv: Optional[List[str]] = None) -> int:
     args = parse_args(argv)
-    token = auth_token()
+    tokens = auth_tokens()
+    token = tokens[0] if tokens else None
     print(
-        f"Using auth token (length {len(token)})." if token
+        f"Using {len(tokens)} auth token(s)." if token
         else "No token — falling back to unauthenticated public data.",
         file=sys.stderr,
     )
-    session = make_session(token)
+    etag_path = os.path.join(args.cache_dir, ETAG_CACHE_FILE) if args.cache_dir else ""
+    repo_path = os.path.join(args.cache_dir, REPO_CACHE_FILE) if args.cache_dir else ""
+    etag_cache = load_json_cache(etag_path) if etag_path else None
+    session = make_session(token, etag_cache, pool_size=args.workers, tokens=tokens)
     now = datetime.now(timezone.utc)
 
-    try:
-        all_repos = fetch_repos(session, token)
-    except requests.RequestException as exc:
-        print(f"Failed to fetch repositories: {exc}", file=sys.stderr)
-        return 1
+    cutoff = window_cutoff(now, args.window_days)
+    all_repos: Optional[List[RepoLite]] = None
+    if token:
+        try:
+            all_repos = fetch_repos_graphql(session, pushed_after=cutoff)
+        except (requests.RequestException, ValueError, KeyError, RuntimeError) as exc:
+            print(f"GraphQL fetch failed ({exc}); falling back to REST.", file=sys.stderr)
+    if all_repos is None:
+        try:
+            all_repos = fetch_repos(session, token, pushed_after=cutoff)
+        except requests.RequestException as exc:
+            print(f"Failed to fetch repositories: {exc}", file=sys.stderr)
+            return 1
 
     active = filter_recently_active(all_repos, now=now, window_days=args.window_days)
     # print(
     #     f"Found {len(active)} / {len(all_repos)} repos active in the last "
     #     f"{args.window_days} days.",
-                                                                
+
     #     file=sys.stderr,
     # )
-    
 
-    rows = build_repo_rows(session, active)
-    public_rows = [r for r in rows if not r.get("private")]
+    # Private repos never reach the table, so drop them before the fan-out
+    # rather than spending 3-4 API calls each on metadata we throw away.
+    public = [r for r in active if not r.private]
+
+    repo_cache = load_json_cache(repo_path) if repo_path else None
+    idle = [r for r in public if repo_cache is not None and repo_cache_key(r) in repo_cache]
+    fetch_first_commits_graphql(
+        session, [r for r in public if repo_cache is None or repo_cache_key(r) not in repo_cache])
+    rows = build_repo_rows(session, public, max_workers=args.workers, cache=repo_cache)
+
+    if args.cache_dir:
+        live = {repo_cache_key(r) for r in public}
+        for path, entries in (
+            (repo_path, {k: v for k, v in repo_cache.items() if k in live}),
+            (etag_path, etag_entries_to_save(
+                session.get_adapter(GITHUB_REST).used, etag_cache, idle)),
+        ):
+            try:
+                save_json_cache(path, entries)
+            except OSError as exc:
+                print(f"Could not write {path}: {exc}", file=sys.stderr)
 
-    sections = {"table": render_repo_table(public_rows)}
+    sections = {"table": render_repo_table(rows)}
     readme = build_readme(sections, now=now, active_window_days=args.window_days)
 
     if args.print_only:
@@ -0,0 +1,525 @@
+from datetime import date, datetime, timezone
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from update_readme import (
+    ETagCacheAdapter,
+    RateLimitedAdapter,
+    RepoLite,
+    _iso_date,
+    _largest_non_html,
+    _parse_links,
+    _repo_from_graphql,
+    auth_tokens,
+    build_repo_rows,
+    etag_entries_to_save,
+    fetch_first_commits_graphql,
+    fetch_repos,
+    fetch_repos_graphql,
+    fetch_commit_stats,
+    iter_paginated,
+    repo_cache_key,
+    shareable_etag_entries,
+    json_dumps,
+    json_loads,
+    make_session,
+    rate_limit_delay,
+)
+
+
+def _node(**overrides):
+    node = {
+        "name": "alpha",
+        "url": "https://github.com/me/alpha",
+        "isPrivate": False,
+        "pushedAt": "2026-04-10T12:00:00Z",
+        "updatedAt": "2026-04-11T12:00:00Z",
+        "diskUsage": 321,
+        "owner": {"login": "me"},
+        "primaryLanguage": {"name": "HTML"},
+        "languages": {"edges": [
+            {"size": 900, "node": {"name": "HTML"}},
+            {"size": 100, "node": {"name": "Python"}},
+        ]},
+        "defaultBranchRef": {"target": {"history": {
+            "totalCount": 42,
+            "nodes": [{"authoredDate": "2026-04-10T11:00:00Z"}],
+        }}},
+    }
+    node.update(overrides)
+    return node
+
+
+def test_repo_from_graphql_fields():
+    r = _repo_from_graphql(_node())
+    assert r.name == "alpha"
+    assert r.html_url == "https://github.com/me/alpha"
+    assert r.owner == "me"
+    assert r.pushed_at == "2026-04-10T12:00:00Z"
+    assert r.size == 321
+    assert r.language == "HTML"
+    assert r.private is False
+
+
+def test_repo_from_graphql_carries_prefetched_metrics():
+    r = _repo_from_graphql(_node())
+    assert r.languages == {"HTML": 900, "Python": 100}
+    assert r.commit_total == 42
+    assert r.last_commit == "2026-04-10T11:00:00Z"
+
+
+def test_repo_from_graphql_empty_repo():
+    r = _repo_from_graphql(_node(defaultBranchRef=None, primaryLanguage=None,
+                                 languages={"edges": []}))
+    assert r.commit_total == 0
+    assert r.last_commit is None
+    assert r.language == ""
+    assert r.languages == {}
+
+
+def test_repo_lite_from_rest_leaves_metrics_unfetched():
+    r = RepoLite.from_rest({
+        "name": "beta", "owner": {"login": "me"}, "private": True,
+        "updated_at": "2026-01-01T00:00:00Z", "size": 7, "language": None,
+    })
+    assert (r.name, r.owner, r.private, r.size, r.language) == ("beta", "me", True, 7, "")
+    assert r.pushed_at == "2026-01-01T00:00:00Z"  # falls back to updated_at
+    assert r.languages is None and r.commit_total is None
+
+
+def test_largest_non_html_skips_html():
+    assert _largest_non_html({"HTML": 900, "CSS": 50, "Python": 100}) == "Python"
+    assert _largest_non_html({"HTML": 900}) is None
+
+
+def _fake_response(status, body=b"", headers=None):
+    resp = requests.Response()
+    resp.status_code = status
+    resp._content = body
+    resp.headers.update(headers or {})
+    return resp
+
+
+def test_etag_adapter_replays_cached_body_on_304(monkeypatch):
+    url = "https://api.github.com/user/repos?per_page=100"
+    adapter = ETagCacheAdapter({url: {"etag": 'W/"abc"', "body": '[{"name": "x"}]',
+                                      "link": '<https://n>; rel="next"'}})
+    seen = {}
+
+    def fake_send(self, request, **kwargs):
+        seen["inm"] = request.headers.get("If-None-Match")
+        return _fake_response(304)
+
+    monkeypatch.setattr(HTTPAdapter, "send", fake_send)
+    req = requests.Request("GET", url).prepare()
+    resp = adapter.send(req)
+    assert seen["inm"] == 'W/"abc"'
+    assert resp.status_code == 200
+    assert resp.json() == [{"name": "x"}]
+    assert resp.headers["Link"] == '<https://n>; rel="next"'
+    assert url in adapter.used
+
+
+def test_etag_adapter_stores_fresh_etag(monkeypatch):
+    url = "https://api.github.com/repos/me/alpha/languages"
+    adapter = ETagCacheAdapter({})
+    monkeypatch.setattr(
+        HTTPAdapter, "send",
+        lambda self, request, **kw: _fake_response(200, b'{"Python": 1}', {"ETag": '"e1"'}),
+    )
+    adapter.send(requests.Request("GET", url).prepare())
+    assert adapter.used[url]["etag"] == '"e1"'
+    assert adapter.used[url]["body"] == '{"Python": 1}'
+
+
+def test_rate_limit_delay_ignores_success_and_permission_errors():
+    assert rate_limit_delay(200, {}, 0) is None
+    assert rate_limit_delay(403, {}, 0) is None
+
+
+def test_rate_limit_delay_honors_retry_after_and_reset():
+    assert rate_limit_delay(429, {"Retry-After": "30"}, 0) == 30.0
+    hdrs = {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "1060"}
+    assert rate_limit_delay(403, hdrs, 0, now=1000.0) == 60.0
+
+
+def test_rate_limit_delay_backs_off_exponentially():
+    assert rate_limit_delay(429, {}, 0) < rate_limit_delay(429, {}, 2)
+
+
+def test_rate_limit_delay_detects_secondary_limit_body():
+    body = b'{"message": "You have exceeded a secondary rate limit. Please wait a few minutes."}'
+    hdrs = {"X-RateLimit-Remaining": "4000"}
+    assert rate_limit_delay(403, hdrs, 0, body=body) == 60.0
+    assert rate_limit_delay(403, hdrs, 0, body=b'{"message": "Resource not accessible"}') is None
+
+
+def test_unauthenticated_adapter_neither_waits_nor_retries_exhausted_budget(monkeypatch):
+    import time
+
+    calls = []
+
+    def exhausted(self, request, **kw):
+        calls.append(request.url)
+        return _fake_response(403, b"{}", {"X-RateLimit-Remaining": "0",
+                                           "X-RateLimit-Reset": str(time.time() + 3000)})
+
+    monkeypatch.setattr(HTTPAdapter, "send", exhausted)
+    adapter = RateLimitedAdapter()
+    req = requests.Request("GET", "https://api.github.com/repos/me/alpha").prepare()
+    assert adapter.send(req).status_code == 403
+    assert adapter.send(req).status_code == 403
+    assert len(calls) == 2
+    assert adapter.pick_token("core") == (None, 0.0)
+
+
+def test_json_roundtrip_is_compact_utf8():
+    blob = json_dumps({"name": "café", "n": [1, 2]})
+    assert isinstance(blob, bytes)
+    assert b" " not in blob
+    assert json_loads(blob) == {"name": "café", "n": [1, 2]}
+
+
+def test_parse_links_reads_every_rel():
+    resp = _fake_response(200, headers={"Link": (
+        '<https://api.github.com/x?page=2>; rel="next", '
+        '<https://api.github.com/x?page=9>; rel="last"'
+    )})
+    links = _parse_links(resp)
+    assert links == {
+        "next": "https://api.github.com/x?page=2",
+        "last": "https://api.github.com/x?page=9",
+    }
+    assert _parse_links(_fake_response(200)) == {}
+
+
+class _PagedSession:
+    """Serves canned JSON pages linked with ``rel="next"``."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.calls = 0
+
+    def get(self, url, params=None, timeout=None):
+        i = self.calls
+        self.calls += 1
+        link = f'<https://api.github.com/p?page={i + 2}>; rel="next"' if i + 1 < len(self.pages) else ""
+        return _fake_response(200, json_dumps(self.pages[i]), {"Link": link})
+
+
+def test_iter_paginated_follows_next_links():
+    session = _PagedSession([[{"n": 1}], [{"n": 2}], [{"n": 3}]])
+    assert [r["n"] for r in iter_paginated(session, "https://api.github.com/p")] == [1, 2, 3]
+    assert session.calls == 3
+
+
+def test_iter_paginated_is_lazy():
+    session = _PagedSession([[{"n": 1}, {"n": 2}], [{"n": 3}], [{"n": 4}]])
+    for item in iter_paginated(session, "https://api.github.com/p"):
+        if item["n"] == 2:
+            break
+    assert session.calls == 1
+
+
+def test_fetch_repos_stops_at_first_repo_outside_window():
+    def repo(name, pushed):
+        return {"name": name, "owner": {"login": "me"}, "pushed_at": pushed}
+
+    session = _PagedSession([
+        [repo("new", "2026-04-10T00:00:00Z"), repo("old", "2025-01-01T00:00:00Z")],
+        [repo("older", "2024-01-01T00:00:00Z")],
+    ])
+    cutoff = datetime(2026, 1, 1, tzinfo=timezone.utc).timestamp()
+    out = fetch_repos(session, None, pushed_after=cutoff)
+    assert [r.name for r in out] == ["new"]
+    assert session.calls == 1
+
+
+def test_iso_date_fast_path_and_fallback():
+    assert _iso_date("2026-04-10T23:59:59Z") == date(2026, 4, 10)
+    assert _iso_date("2026-04-10T23:59:59+02:00") == date(2026, 4, 10)
+    assert _iso_date("") is None
+    assert _iso_date("garbage") is None
+
+
+class _StatusSession:
+    """Answers every GET with the same status code, recording the URLs."""
+
+    def __init__(self, status):
+        self.status = status
+        self.urls = []
+
+    def get(self, url, params=None, timeout=None):
+        self.urls.append(url)
+        return _fake_response(self.status)
+
+
+def test_fetch_commit_stats_409_means_empty_other_errors_unknown():
+    assert fetch_commit_stats(_StatusSession(409), "me", "alpha") == (0, None, None)
+    assert fetch_commit_stats(_StatusSession(500), "me", "alpha") == (None, None, None)
+
+
+def test_build_repo_rows_skips_rest_calls_for_empty_repo():
+    session = _StatusSession(500)
+    repo = _repo_from_graphql(_node(defaultBranchRef=None, primaryLanguage=None))
+    rows = build_repo_rows(session, [repo])
+    assert session.urls == []
+    assert rows[0]["commits"] == 0 and rows[0]["team_size"] == 0
+
+
+class _GraphQLSession:
+    """Answers every POST with ``payload``, recording the variables sent."""
+
+    def __init__(self, payload):
+        self.payload = payload
+        self.sent = []
+
+    def post(self, url, json=None, timeout=None):
+        self.sent.append(json["variables"])
+        return _fake_response(200, json_dumps(self.payload))
+
+
+def test_fetch_first_commits_graphql_fills_only_answered_repos():
+    repos = [
+        _repo_from_graphql(_node(name="a")),
+        _repo_from_graphql(_node(name="b")),
+        _repo_from_graphql(_node(name="single", defaultBranchRef={"target": {
+            "oid": "f00", "history": {"totalCount": 1, "nodes": []}}})),
+    ]
+    repos[0].head_oid = repos[1].head_oid = "abc123"
+    session = _GraphQLSession({"data": {
+        "r0": {"defaultBranchRef": {"target": {"history": {
+            "nodes": [{"authoredDate": "2020-01-02T00:00:00Z"}]}}}},
+        "r1": None,
+    }})
+    fetch_first_commits_graphql(session, repos)
+    # The single-commit repo needs no lookup, so only one 2-repo query is sent.
+    assert len(session.sent) == 1
+    assert session.sent[0]["c0"] == "abc123 40"
+    assert repos[0].first_commit == "2020-01-02T00:00:00Z"
+    assert repos[1].first_commit is None
+    assert repos[2].first_commit is None
+
+
+def test_pick_token_prefers_most_budget_and_waits_when_all_low():
+    import time
+
+    adapter = RateLimitedAdapter(tokens=["a", "b"])
+    soon, later = time.time() + 30, time.time() + 60
+    adapter._record("a", "core", {"X-RateLimit-Remaining": "4000", "X-RateLimit-Reset": str(later)})
+    adapter._record("b", "core", {"X-RateLimit-Remaining": "4500", "X-RateLimit-Reset": str(later)})
+    assert adapter.pick_token("core") == ("b", 0.0)
+    # GraphQL budget is tracked separately, so an unseen token is preferred.
+    adapter._record("b", "graphql", {"X-RateLimit-Remaining": "3", "X-RateLimit-Reset": str(later)})
+    assert adapter.pick_token("graphql") == ("a", 0.0)
+
+    adapter._record("a", "core", {"X-RateLimit-Remaining": "1", "X-RateLimit-Reset": str(later)})
+    adapter._record("b", "core", {"X-RateLimit-Remaining": "2", "X-RateLimit-Reset": str(soon)})
+    token, wait = adapter.pick_token("core")
+    assert token == "b" and 0 < wait <= 30
+
+
+def test_viewer_listing_pages_stay_on_primary_token(monkeypatch):
+    import time
+
+    reset = str(time.time() + 3600)
+    sent = []
+
+    def fake_send(self, request, **kw):
+        sent.append((request.url, request.headers["Authorization"]))
+        if request.url.endswith("/graphql"):
+            cursor = json_loads(request.body)["variables"]["cursor"]
+            body = {"data": {"viewer": {"repositories": {
+                "nodes": [_node(name=cursor or "first")],
+                "pageInfo": {"hasNextPage": cursor is None, "endCursor": "second"},
+            }}}}
+        else:
+            body = []
+        headers = {"X-RateLimit-Remaining": "100", "X-RateLimit-Reset": reset}
+        return _fake_response(200, json_dumps(body), headers)
+
+    monkeypatch.setattr(HTTPAdapter, "send", fake_send)
+    session = make_session("a", tokens=["a", "b"])
+    assert [r.name for r in fetch_repos_graphql(session)] == ["first", "second"]
+    session.get("https://api.github.com/user/repos")
+    session.get("https://api.github.com/repos/me/alpha/contributors")
+    # "b" has no recorded budget, so only the per-repo call may move to it.
+    assert [auth for _, auth in sent] == ["token a"] * 3 + ["token b"]
+
+
+def test_adapter_never_sends_token_to_other_hosts(monkeypatch):
+    seen = []
+
+    def fake_send(self, request, **kw):
+        seen.append(request.headers.get("Authorization"))
+        return _fake_response(200)
+
+    monkeypatch.setattr(HTTPAdapter, "send", fake_send)
+    adapter = RateLimitedAdapter(tokens=["a", "b"])
+    # What requests hands the adapter after a cross-host redirect.
+    adapter.send(requests.Request("GET", "https://objects.example.com/archive.zip").prepare())
+    assert seen == [None]
+
+
+def test_auth_tokens_merges_and_dedupes(monkeypatch):
+    for name in ("GH_PAT", "GITHUB_TOKEN", "GH_TOKEN"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("GH_PAT", "t1")
+    monkeypatch.setenv("GH_PATS", "t2, t1,,t3")
+    assert auth_tokens() == ["t1", "t2", "t3"]
+
+
+def test_build_repo_rows_serves_unchanged_repos_from_cache():
+    session = _StatusSession(500)
+    repo = _repo_from_graphql(_node())
+    key = repo_cache_key(repo)
+    assert key == "me/alpha@2026-04-10T12:00:00Z"
+    # A stale row from an older cache: only the API-derived stats are reused.
+    cached = {"commits": 42, "lifespan_days": 7, "team_size": 2,
+              "size": 1, "language": "Go"}
+    rows = build_repo_rows(session, [repo], cache={key: cached})
+    assert session.urls == []
+    assert (rows[0]["commits"], rows[0]["lifespan_days"], rows[0]["team_size"]) == (42, 7, 2)
+    assert (rows[0]["size"], rows[0]["language"]) == (321, "Python")
+
+
+def test_build_repo_rows_caches_only_api_derived_stats():
+    cache = {}
+    repo = _repo_from_graphql(_node(defaultBranchRef=None))
+    build_repo_rows(_StatusSession(500), [repo], cache=cache)
+    assert cache == {repo_cache_key(repo): {"commits": 0, "lifespan_days": None, "team_size": 0}}
+
+
+def test_build_repo_rows_caches_only_complete_rows():
+    cache = {}
+    empty = _repo_from_graphql(_node(name="empty", defaultBranchRef=None))
+    broken = RepoLite.from_rest({"name": "broken", "owner": {"login": "me"},
+                                 "pushed_at": "2026-04-10T12:00:00Z"})
+    build_repo_rows(_StatusSession(500), [empty, broken], cache=cache)
+    # The empty repo is fully known; the REST failure must be retried next run.
+    assert list(cache) == [repo_cache_key(empty)]
+
+
+def test_build_repo_rows_does_not_cache_failed_contributor_lookup():
+    cache = {}
+    repo = _repo_from_graphql(_node(primaryLanguage={"name": "Python"}))
+    repo.first_commit = "2026-01-01T00:00:00Z"
+    session = _StatusSession(500)
+    rows = build_repo_rows(session, [repo], cache=cache)
+    assert session.urls == ["https://api.github.com/repos/me/alpha/contributors"]
+    assert rows[0]["team_size"] == 0
+    assert cache == {}
+
+
+def test_repo_listing_pages_replay_from_etag_cache(monkeypatch):
+    base = "https://api.github.com/user/repos"
+    page1 = f"{base}?per_page=100"
+    page2 = f"{base}?per_page=100&page=2"
+    cache = {
+        page1: {"etag": '"p1"', "body": '[{"n": 1}]', "link": f'<{page2}>; rel="next"'},
+        page2: {"etag": '"p2"', "body": '[{"n": 2}]', "link": ""},
+    }
+
+    def not_modified(self, request, **kw):
+        resp = _fake_response(304)
+        resp.url = request.url
+        return resp
+
+    monkeypatch.setattr(HTTPAdapter, "send", not_modified)
+    session = make_session("t", cache)
+    assert [r["n"] for r in iter_paginated(session, base)] == [1, 2]
+    assert set(session.get_adapter(base).used) == {page1, page2}
+
+
+def test_shareable_etag_entries_drops_authenticated_listing():
+    entries = {
+        "https://api.github.com/user/repos?per_page=100": {"etag": '"p"'},
+        "https://api.github.com/users/me/repos?per_page=100": {"etag": '"u"'},
+        "https://api.github.com/repos/me/alpha/languages": {"etag": '"l"'},
+    }
+    assert set(shareable_etag_entries(entries)) == {
+        "https://api.github.com/users/me/repos?per_page=100",
+        "https://api.github.com/repos/me/alpha/languages",
+    }
+
+
+def test_rate_limited_response_is_retried_by_the_adapter_only(monkeypatch):
+    import threading
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+
+    import update_readme
+
+    hits = []
+
+    class TooMany(BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits.append(self.path)
+            self.send_response(429)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), TooMany)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    monkeypatch.setattr(update_readme, "GITHUB_REST", base)
+    monkeypatch.setattr(update_readme, "RATE_LIMIT_BACKOFF", 0.0)
+    try:
+        session = make_session("t")
+        session.mount("http://", session.get_adapter("https://api.github.com"))
+        assert session.get(f"{base}/repos/me/alpha").status_code == 429
+    finally:
+        server.shutdown()
+    # One request plus RATE_LIMIT_RETRIES adapter retries; urllib3 adds none.
+    assert len(hits) == 1 + update_readme.RATE_LIMIT_RETRIES
+
+
+def test_adapter_fails_fast_when_reset_is_past_the_cap(monkeypatch):
+    import time
+
+    import update_readme
+
+    reset = str(time.time() + 3000)
+    calls, sleeps = [], []
+
+    def send(self, request, **kw):
+        calls.append(request.headers["Authorization"])
+        if request.headers["Authorization"] == "token a":
+            return _fake_response(403, b"{}", {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset})
+        return _fake_response(200, b"{}", {"X-RateLimit-Remaining": "4000", "X-RateLimit-Reset": reset})
+
+    monkeypatch.setattr(HTTPAdapter, "send", send)
+    monkeypatch.setattr(update_readme.time, "sleep", sleeps.append)
+    req = requests.Request("GET", "https://api.github.com/repos/me/alpha").prepare()
+
+    adapter = RateLimitedAdapter(tokens=["a"])
+    adapter._record("a", "core", {"X-RateLimit-Remaining": "5", "X-RateLimit-Reset": reset})
+    assert adapter.send(req).status_code == 403
+    assert calls == ["token a"] and sleeps == []
+
+    # With a second account's token the exhausted one is simply rotated away.
+    calls.clear()
+    adapter = RateLimitedAdapter(tokens=["a", "b"])
+    assert adapter.send(req).status_code == 200
+    assert calls == ["token a", "token b"] and sleeps == []
+
+
+def test_etag_entries_to_save_keeps_entries_of_repos_served_from_cache():
+    api = "https://api.github.com"
+    previous = {
+        f"{api}/repos/me/alpha/contributors?per_page=1": {"etag": '"old-a"'},
+        f"{api}/repos/me/alpha-two/contributors?per_page=1": {"etag": '"old-a2"'},
+        f"{api}/repos/me/gone/contributors?per_page=1": {"etag": '"old-g"'},
+        f"{api}/user/repos?per_page=100": {"etag": '"p"'},
+    }
+    used = {f"{api}/repos/me/beta/contributors?per_page=1": {"etag": '"b"'}}
+    idle = [_repo_from_graphql(_node(name="alpha"))]
+    assert etag_entries_to_save(used, previous, idle) == {
+        f"{api}/repos/me/alpha/contributors?per_page=1": {"etag": '"old-a"'},
+        f"{api}/repos/me/beta/contributors?per_page=1": {"etag": '"b"'},
+    }
+    assert etag_entries_to_save(used, previous, []) == used
@@ -2,6 +2,7 @@ import re
 
 from update_readme import (
     TABLE_COLS,
+    RepoLite,
     _fmt_lifespan,
     filter_recently_active,
     render_repo_table,
@@ -30,7 +31,8 @@ def test_filter_recently_active_keeps_in_window_drops_out():
         {"name": "edge", "pushed_at": "2025-10-23T00:00:00Z"},             # ~179d ago (in)
         {"name": "nothing"},                                                # no timestamp
     ]
-    out = [r["name"] for r in filter_recently_active(repos, now=now, window_days=180)]
+    repos = [RepoLite.from_rest(r) for r in repos]
+    out = [r.name for r in filter_recently_active(repos, now=now, window_days=180)]
     assert "fresh" in out
     assert "edge" in out
     assert "stale" not in out